@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import logging
+import ssl
 from datetime import date, datetime
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_TOKEN, Platform
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import ConfigEntryAuthFailed, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from pylinky import (
     AsyncLinkyClient,
     AuthenticationError,
@@ -27,25 +29,103 @@ PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 type LinkyConfigEntry = ConfigEntry[LinkyDataUpdateCoordinator]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 SERVICE_IMPORT_HISTORICAL_DATA = "import_historical_data"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
 ATTR_START_DATE = "start_date"
 ATTR_END_DATE = "end_date"
 
 SERVICE_IMPORT_HISTORICAL_DATA_SCHEMA = vol.Schema(
     {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
         vol.Required(ATTR_START_DATE): cv.date,
         vol.Optional(ATTR_END_DATE): cv.date,
     }
 )
 
+# The SSL context is identical for every entry, build it only once
+_SSL_CONTEXT: ssl.SSLContext | None = None
+
+
+async def _get_ssl_context(hass: HomeAssistant) -> ssl.SSLContext:
+    """Return the shared SSL context, creating it on first use."""
+    global _SSL_CONTEXT
+
+    if _SSL_CONTEXT is None:
+        # Create SSL context in executor to avoid blocking the event loop, entries
+        # set up concurrently may both create one which is harmless
+        _SSL_CONTEXT = await hass.async_add_executor_job(create_ssl_context)
+    return _SSL_CONTEXT
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Linky integration."""
+
+    async def handle_import_historical_data(call: ServiceCall) -> None:
+        """Handle the import_historical_data service call."""
+        # Use the same day for the default and the validation, even around midnight
+        today = date.today()
+        start_date = call.data[ATTR_START_DATE]
+        end_date = call.data.get(ATTR_END_DATE, today)
+
+        # Validate dates
+        if start_date > end_date:
+            raise ServiceValidationError("start_date must be before or equal to end_date")
+
+        if end_date > today:
+            raise ServiceValidationError("end_date cannot be in the future")
+
+        for entry in _get_loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            _LOGGER.info(
+                "Importing historical data from %s to %s for PRM %s",
+                start_date,
+                end_date,
+                entry.data[CONF_PRM],
+            )
+
+            # Import the statistics
+            await entry.runtime_data.import_statistics(start_date, end_date)
+
+        _LOGGER.info("Historical data import completed")
+
+    # Register the service once, it stays available for the lifetime of Home Assistant
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORICAL_DATA,
+        handle_import_historical_data,
+        schema=SERVICE_IMPORT_HISTORICAL_DATA_SCHEMA,
+    )
+
+    return True
+
+
+def _get_loaded_entries(hass: HomeAssistant, entry_id: str | None) -> list[LinkyConfigEntry]:
+    """Return the loaded entries targeted by a service call."""
+    if entry_id is None:
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+        if not entries:
+            raise ServiceValidationError("No Linky meter is loaded")
+        return entries
+
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"Config entry {entry_id} is not a Linky meter")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+    return [entry]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: LinkyConfigEntry) -> bool:
     """Set up Linky from a config entry."""
     token = entry.data[CONF_TOKEN]
     prm = entry.data[CONF_PRM]
 
-    # Create SSL context in executor to avoid blocking the event loop
-    ssl_context = await hass.async_add_executor_job(create_ssl_context)
+    ssl_context = await _get_ssl_context(hass)
 
     try:
         client = AsyncLinkyClient(
@@ -68,40 +148,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: LinkyConfigEntry) -> boo
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Register services
-    async def handle_import_historical_data(call: ServiceCall) -> None:
-        """Handle the import_historical_data service call."""
-        start_date = call.data[ATTR_START_DATE]
-        end_date = call.data.get(ATTR_END_DATE, date.today())
-
-        # Validate dates
-        if start_date > end_date:
-            raise ServiceValidationError("start_date must be before or equal to end_date")
-
-        if end_date > date.today():
-            raise ServiceValidationError("end_date cannot be in the future")
-
-        _LOGGER.info(
-            "Importing historical data from %s to %s for PRM %s",
-            start_date,
-            end_date,
-            prm,
-        )
-
-        # Import the statistics
-        await coordinator.import_statistics(start_date, end_date)
-
-        _LOGGER.info("Historical data import completed")
-
-    # Register the service only once per domain
-    if not hass.services.has_service(DOMAIN, SERVICE_IMPORT_HISTORICAL_DATA):
-        hass.services.async_register(
-            DOMAIN,
-            SERVICE_IMPORT_HISTORICAL_DATA,
-            handle_import_historical_data,
-            schema=SERVICE_IMPORT_HISTORICAL_DATA_SCHEMA,
-        )
-
     return True
 
 
@@ -110,9 +156,4 @@ async def async_unload_entry(hass: HomeAssistant, entry: LinkyConfigEntry) -> bo
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         await entry.runtime_data.client.close()
 
-        # Unregister services if no more entries
-        entries = hass.config_entries.async_entries(DOMAIN)
-        if len(entries) == 1:  # This entry is the last one
-            hass.services.async_remove(DOMAIN, SERVICE_IMPORT_HISTORICAL_DATA)
-
     return unload_ok
@@ -8,6 +8,7 @@ from typing import Any
 import voluptuous as vol
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
 from homeassistant.const import CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import AbortFlow
 from homeassistant.helpers.selector import (
     SelectSelector,
@@ -23,6 +24,16 @@ from .const import CONF_PRM, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_TOKEN): TextSelector(TextSelectorConfig(type=TextSelectorType.PASSWORD)),
+    }
+)
+
+STEP_USER_DESCRIPTION_PLACEHOLDERS = {
+    "conso_url": "https://conso.boris.sh",
+}
+
 
 class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Linky."""
@@ -33,6 +44,19 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._token: str | None = None
         self._prms: list[str] = []
+        self._client: AsyncLinkyClient | None = None
+        self._prm_schema: vol.Schema | None = None
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the client when the flow is finished or aborted."""
+        self._set_client(None)
+
+    def _set_client(self, client: AsyncLinkyClient | None) -> None:
+        """Store the client used by the flow, closing the previous one."""
+        if self._client is not None and self._client is not client:
+            self.hass.async_create_task(self._client.close())
+        self._client = client
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -45,8 +69,10 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
 
             try:
                 client = AsyncLinkyClient(token=token)
+                self._set_client(client)
                 self._token = token
                 self._prms = client.prms
+                self._prm_schema = None
 
                 if len(self._prms) == 1:
                     # Single PRM, skip selection
@@ -65,17 +91,9 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_TOKEN): TextSelector(
-                        TextSelectorConfig(type=TextSelectorType.PASSWORD)
-                    ),
-                }
-            ),
+            data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
-            description_placeholders={
-                "conso_url": "https://conso.boris.sh",
-            },
+            description_placeholders=STEP_USER_DESCRIPTION_PLACEHOLDERS,
         )
 
     async def async_step_select_prm(
@@ -92,7 +110,8 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
                 if self._token is None:
                     errors["base"] = "unknown"
                 else:
-                    AsyncLinkyClient(token=self._token, prm=prm)
+                    # pylinky validates PRM access when the client is bound to it
+                    self._set_client(AsyncLinkyClient(token=self._token, prm=prm))
                     return await self._create_entry(prm)
             except PRMAccessError:
                 errors["base"] = "prm_access_denied"
@@ -102,7 +121,14 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="select_prm",
-            data_schema=vol.Schema(
+            data_schema=self._select_prm_schema(),
+            errors=errors,
+        )
+
+    def _select_prm_schema(self) -> vol.Schema:
+        """Return the PRM selection schema, built once the PRMs are known."""
+        if self._prm_schema is None:
+            self._prm_schema = vol.Schema(
                 {
                     vol.Required(CONF_PRM): SelectSelector(
                         SelectSelectorConfig(
@@ -111,9 +137,8 @@ class LinkyConfigFlow(ConfigFlow, domain=DOMAIN):
                         )
                     ),
                 }
-            ),
-            errors=errors,
-        )
+            )
+        return self._prm_schema
 
     async def _create_entry(self, prm: str) -> ConfigFlowResult:
         """Create a config entry for the given PRM."""
@@ -9,11 +9,20 @@ DOMAIN: Final = "linky"
 CONF_TOKEN: Final = "token"
 CONF_PRM: Final = "prm"
 
+# Options
+CONF_PRODUCTION_DISABLED: Final = "production_disabled"
+
 # Default values
 DEFAULT_SCAN_INTERVAL: Final = timedelta(hours=6)
 
-# API rate limiting: 5 req/sec max, we use 200ms delay between requests to be safe
-API_REQUEST_DELAY: Final = 0.2
+# Oldest day fetched by the periodic update
+FETCH_WINDOW: Final = timedelta(days=7)
+
+# API rate limiting: 5 req/sec max
+API_MAX_REQUESTS_PER_SECOND: Final = 5
+
+# Consecutive failed updates before production data is only checked once a day
+PRODUCTION_MAX_FAILURES: Final = 3
 
 # Attributes
 ATTR_USAGE_POINT_ID: Final = "usage_point_id"
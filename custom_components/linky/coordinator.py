@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta, tzinfo
+from itertools import islice
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from homeassistant.components.recorder import get_instance
@@ -15,25 +20,128 @@ from homeassistant.components.recorder.models import (
     StatisticMetaData,
 )
 from homeassistant.components.recorder.statistics import (
+    StatisticsRow,
     async_add_external_statistics,
     get_last_statistics,
 )
 from homeassistant.const import UnitOfEnergy
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_conversion import EnergyConverter
 from pylinky import APIError, AsyncLinkyClient, AuthenticationError, MeteringData
 
-from .const import API_REQUEST_DELAY, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    API_MAX_REQUESTS_PER_SECOND,
+    CONF_PRODUCTION_DISABLED,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    FETCH_WINDOW,
+    PRODUCTION_MAX_FAILURES,
+)
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# LinkyData attribute and client method fetching each metering series
+FETCHERS: tuple[tuple[str, str], ...] = (
+    ("daily_consumption", "get_daily_consumption"),
+    ("load_curve", "get_consumption_load_curve"),
+    ("max_power", "get_max_power"),
+    ("daily_production", "get_daily_production"),
+    ("production_load_curve", "get_production_load_curve"),
+)
+PRODUCTION_SERIES = ("daily_production", "production_load_curve")
+
+_MIDNIGHT = time.min
+
+
+def _statistic_metadata(prm: str, kind: str) -> StatisticMetaData:
+    """Return the metadata of the consumption or production statistics of a PRM."""
+    return StatisticMetaData(
+        mean_type=StatisticMeanType.NONE,
+        has_sum=True,
+        name=f"Linky {prm} {kind}",
+        source=DOMAIN,
+        statistic_id=f"{DOMAIN}:{prm}_energy_{kind}",
+        unit_class=EnergyConverter.UNIT_CLASS,
+        unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+    )
+
+
+def _get_last_statistics(
+    hass: HomeAssistant, statistic_ids: Iterable[str]
+) -> dict[str, list[StatisticsRow]]:
+    """Get the last statistic of each statistic ID in a single executor job."""
+    last_stats: dict[str, list[StatisticsRow]] = {}
+    for statistic_id in statistic_ids:
+        last_stats.update(get_last_statistics(hass, 1, statistic_id, False, {"sum"}))
+    return last_stats
+
+
+def _build_statistics(
+    metering_data: MeteringData | None,
+    initial_sum: float,
+    time_zone: tzinfo,
+    after: date | None = None,
+) -> tuple[list[StatisticData], float]:
+    """Build daily statistics from readings, skipping those on or before `after`.
+
+    Returns the statistics and the running sum after the last one.
+    """
+    statistics: list[StatisticData] = []
+    total = initial_sum
+    if metering_data is None:
+        return statistics, total
+
+    readings = metering_data.interval_reading
+    # Readings are sorted by date, skip the ones we already have with a single search
+    first = bisect_right(readings, after, key=attrgetter("date")) if after else 0
+
+    for reading in islice(readings, first, None):
+        reading_date = reading.date
+
+        # Value in Wh
+        state = float(reading.value)
+        total += state
+
+        statistics.append(
+            StatisticData(
+                # Convert date to datetime at local midnight
+                start=datetime.combine(reading_date, _MIDNIGHT, time_zone),
+                state=state,
+                sum=total,
+            )
+        )
+
+    return statistics, total
+
+
+class RateLimiter:
+    """Limit the number of requests sent in any one second window."""
+
+    def __init__(self, max_per_second: int) -> None:
+        """Initialize the rate limiter."""
+        self._max_per_second = max_per_second
+        self._sent: deque[float] = deque()
+        self._lock = asyncio.Lock()
 
-@dataclass
+    async def acquire(self) -> None:
+        """Wait until a request can be sent without exceeding the rate limit."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            while self._sent and now - self._sent[0] >= 1:
+                self._sent.popleft()
+            if len(self._sent) >= self._max_per_second:
+                await asyncio.sleep(self._sent.popleft() + 1 - now)
+            self._sent.append(loop.time())
+
+
+@dataclass(frozen=True, slots=True)
 class LinkyData:
     """Data class to hold all Linky data."""
 
@@ -60,76 +168,140 @@ class LinkyDataUpdateCoordinator(DataUpdateCoordinator[LinkyData]):
             _LOGGER,
             name=DOMAIN,
             update_interval=DEFAULT_SCAN_INTERVAL,
+            # Skip listener updates when the API has no new readings
+            always_update=False,
         )
         self.client = client
+        self._rate_limiter = RateLimiter(API_MAX_REQUESTS_PER_SECOND)
+        self._available = {name for name, _ in FETCHERS}
+        if self.config_entry and self.config_entry.options.get(CONF_PRODUCTION_DISABLED):
+            self._available.difference_update(PRODUCTION_SERIES)
+        self._unavailable_checked: date | None = None
+        self._production_failures = 0
+        self._last_end: dict[str, date] = {}
+        # Results of the setup probe, reused by the first refresh
+        self._probed: tuple[date, dict[str, MeteringData | None]] | None = None
+        # Last statistic date and sum of each series, read from the recorder on
+        # first insertion
+        self._last_stats: dict[str, tuple[date, float]] | None = None
+        self._consumption_metadata = _statistic_metadata(client.prm, "consumption")
+        self._production_metadata = _statistic_metadata(client.prm, "production")
+
+    async def _async_setup(self) -> None:
+        """Probe which metering series are available for this PRM.
+
+        The probe fetches the same window as the update, the first refresh
+        reuses its results and only fetches the series which failed again.
+        """
+        end = date.today()
+        start = end - FETCH_WINDOW
+        fetchers = [fetcher for fetcher in FETCHERS if fetcher[0] in self._available]
+
+        results = await self._fetch_series(fetchers, {name: start for name, _ in fetchers}, end)
+
+        probed: dict[str, MeteringData | None] = {}
+        for (name, _), result in zip(fetchers, results, strict=True):
+            if isinstance(result, AuthenticationError):
+                raise ConfigEntryAuthFailed("Authentication failed") from result
+            if isinstance(result, APIError):
+                # Only production is missing for a whole meter, a consumption
+                # error may be transient and is retried by the first refresh
+                _LOGGER.debug("Series %s is not available: %s", name, result)
+                if name in PRODUCTION_SERIES:
+                    self._available.discard(name)
+            elif isinstance(result, BaseException):
+                raise UpdateFailed(f"Error communicating with API: {result}") from result
+            else:
+                probed[name] = result
+
+        # Persist the production latch when the meter has no production at all
+        probed_production = {name for name, _ in fetchers}.intersection(PRODUCTION_SERIES)
+        if probed_production and self._available.isdisjoint(PRODUCTION_SERIES):
+            self._set_production_disabled(True)
+
+        # Unavailable series are checked again on the next day
+        self._unavailable_checked = end
+        self._probed = (end, probed)
+
+    def _pop_probed(self, end: date) -> dict[str, MeteringData | BaseException | None]:
+        """Return the setup probe results if they were fetched for this update."""
+        probed, self._probed = self._probed, None
+        if probed is None or probed[0] != end:
+            return {}
+        return dict(probed[1])
 
     async def _async_update_data(self) -> LinkyData:
         """Fetch data from Linky API."""
-        data = LinkyData()
+        values: dict[str, MeteringData | None] = {}
 
-        # Fetch data for the last 7 days to get recent consumption for sensors
+        # Fetch data for the last 7 days to get recent consumption for sensors,
+        # then only the days since the previous successful fetch
         # The API returns data up to yesterday typically
         end = date.today()
-        start = end - timedelta(days=7)
-
+        window_start = end - FETCH_WINDOW
+
+        # Series which are not available (e.g. production if user has no solar
+        # panels) are only checked once a day
+        check_unavailable = self._unavailable_checked != end
+        if check_unavailable:
+            self._unavailable_checked = end
+        fetchers = [
+            fetcher for fetcher in FETCHERS if check_unavailable or fetcher[0] in self._available
+        ]
+
+        fetch_production = any(name in PRODUCTION_SERIES for name, _ in fetchers)
+        production_failed = fetch_production
+        starts = {name: self._fetch_start(name, window_start) for name, _ in fetchers}
+
+        # Failed updates drop the cached statistics state, the next insertion
+        # reads it from the recorder again
         try:
-            # Fetch consumption data with delays between requests
-            # to respect API rate limits (max 5 req/sec)
-            try:
-                data.daily_consumption = await self.client.get_daily_consumption(
-                    start=start, end=end
-                )
-            except AuthenticationError:
-                raise
-            except APIError as err:
-                _LOGGER.debug("Failed to fetch daily consumption: %s", err)
-
-            await asyncio.sleep(API_REQUEST_DELAY)
-
-            try:
-                data.load_curve = await self.client.get_consumption_load_curve(start=start, end=end)
-            except AuthenticationError:
-                raise
-            except APIError as err:
-                _LOGGER.debug("Failed to fetch load curve: %s", err)
-
-            await asyncio.sleep(API_REQUEST_DELAY)
-
-            try:
-                data.max_power = await self.client.get_max_power(start=start, end=end)
-            except AuthenticationError:
-                raise
-            except APIError as err:
-                _LOGGER.debug("Failed to fetch max power: %s", err)
-
-            await asyncio.sleep(API_REQUEST_DELAY)
-
-            # Fetch production data (may fail if user has no solar panels)
-            try:
-                data.daily_production = await self.client.get_daily_production(start=start, end=end)
-            except AuthenticationError:
-                raise
-            except APIError as err:
-                _LOGGER.debug("Failed to fetch daily production: %s", err)
-
-            await asyncio.sleep(API_REQUEST_DELAY)
-
-            try:
-                data.production_load_curve = await self.client.get_production_load_curve(
-                    start=start, end=end
-                )
-            except AuthenticationError:
-                raise
-            except APIError as err:
-                _LOGGER.debug("Failed to fetch production load curve: %s", err)
+            results = self._pop_probed(end)
+            missing = [fetcher for fetcher in fetchers if fetcher[0] not in results]
+            fetched = await self._fetch_series(missing, starts, end)
+            results.update(zip((name for name, _ in missing), fetched, strict=True))
+
+            for name, _ in fetchers:
+                result = results[name]
+                if isinstance(result, AuthenticationError):
+                    raise result
+                if isinstance(result, APIError):
+                    _LOGGER.debug("Failed to fetch %s: %s", name, result)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    values[name] = result
+                    if name not in self._available:
+                        _LOGGER.info("Series %s is available again", name)
+                        self._available.add(name)
+                        if name == "daily_production":
+                            # The production sum was not read while unavailable
+                            self._last_stats = None
+                    if name in PRODUCTION_SERIES:
+                        production_failed = False
+                    if result is not None and result.interval_reading:
+                        self._last_end[name] = end
+                        continue
+
+                # An incremental fetch may have nothing new yet, keep the previous readings
+                if starts[name] > window_start and self.data is not None:
+                    values[name] = getattr(self.data, name)
 
         except AuthenticationError as err:
+            self._last_stats = None
             raise UpdateFailed(f"Authentication failed: {err}") from err
         except Exception as err:
+            self._last_stats = None
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        if fetch_production:
+            self._update_production_state(production_failed, end)
+
+        data = LinkyData(**values)
+
         # If we got no data at all, something is wrong
         if data.daily_consumption is None and data.load_curve is None and data.max_power is None:
+            self._last_stats = None
             raise UpdateFailed("Failed to fetch any consumption data from API")
 
         # Insert statistics using the data we already fetched (no extra API calls)
@@ -144,6 +316,59 @@ class LinkyDataUpdateCoordinator(DataUpdateCoordinator[LinkyData]):
 
         return data
 
+    def _fetch_start(self, name: str, window_start: date) -> date:
+        """Return the first day to fetch for a series."""
+        if (last_end := self._last_end.get(name)) is None:
+            return window_start
+        # Fetch the last day again in case it was published after the previous fetch
+        return max(last_end - timedelta(days=1), window_start)
+
+    def _update_production_state(self, failed: bool, today: date) -> None:
+        """Track production failures and disable production after repeated ones."""
+        if not failed:
+            self._production_failures = 0
+            self._set_production_disabled(False)
+            return
+
+        self._production_failures += 1
+        production_available = not self._available.isdisjoint(PRODUCTION_SERIES)
+        if production_available and self._production_failures >= PRODUCTION_MAX_FAILURES:
+            _LOGGER.info(
+                "Production data unavailable after %s attempts, checking it once a day",
+                self._production_failures,
+            )
+            self._available.difference_update(PRODUCTION_SERIES)
+            self._unavailable_checked = today
+            self._set_production_disabled(True)
+
+    def _set_production_disabled(self, disabled: bool) -> None:
+        """Persist the production latch in the config entry options."""
+        if self.config_entry is None:
+            return
+        if self.config_entry.options.get(CONF_PRODUCTION_DISABLED, False) == disabled:
+            return
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            options={**self.config_entry.options, CONF_PRODUCTION_DISABLED: disabled},
+        )
+
+    async def _fetch_series(
+        self,
+        fetchers: list[tuple[str, str]],
+        starts: dict[str, date],
+        end: date,
+    ) -> list[MeteringData | BaseException | None]:
+        """Fetch metering series concurrently, returning exceptions in place of results."""
+        return await asyncio.gather(
+            *(self._fetch(method_name, starts[name], end) for name, method_name in fetchers),
+            return_exceptions=True,
+        )
+
+    async def _fetch(self, method_name: str, start: date, end: date) -> MeteringData | None:
+        """Fetch a metering series once the rate limiter allows it."""
+        await self._rate_limiter.acquire()
+        return await getattr(self.client, method_name)(start=start, end=end)
+
     async def _insert_statistics(
         self,
         daily_consumption: MeteringData | None = None,
@@ -153,11 +378,10 @@ class LinkyDataUpdateCoordinator(DataUpdateCoordinator[LinkyData]):
 
         Uses data already fetched by _async_update_data to avoid duplicate API calls.
         """
-        prm = self.client.prm
-
-        # Define statistic IDs
-        consumption_statistic_id = f"{DOMAIN}:{prm}_energy_consumption"
-        production_statistic_id = f"{DOMAIN}:{prm}_energy_production"
+        consumption_metadata = self._consumption_metadata
+        production_metadata = self._production_metadata
+        consumption_statistic_id = consumption_metadata["statistic_id"]
+        production_statistic_id = production_metadata["statistic_id"]
 
         _LOGGER.debug(
             "Updating statistics for consumption: %s and production: %s",
@@ -165,234 +389,127 @@ class LinkyDataUpdateCoordinator(DataUpdateCoordinator[LinkyData]):
             production_statistic_id,
         )
 
-        # Metadata for consumption statistics
-        consumption_metadata = StatisticMetaData(
-            mean_type=StatisticMeanType.NONE,
-            has_sum=True,
-            name=f"Linky {prm} consumption",
-            source=DOMAIN,
-            statistic_id=consumption_statistic_id,
-            unit_class=EnergyConverter.UNIT_CLASS,
-            unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        )
+        time_zone = dt_util.get_default_time_zone()
+
+        if self._last_stats is None:
+            self._last_stats = await self._async_get_last_stats(time_zone)
+        # Each series moves forward from its own last inserted day
+        last_stats = dict(self._last_stats)
+
+        # Process data already fetched by _async_update_data
+        new_statistics: list[tuple[StatisticMetaData, list[StatisticData]]] = []
+        for metadata, metering_data in (
+            (consumption_metadata, daily_consumption),
+            (production_metadata, daily_production),
+        ):
+            statistic_id = metadata["statistic_id"]
+            last_stats_date, total = last_stats.get(statistic_id, (None, 0.0))
+            statistics, total = _build_statistics(metering_data, total, time_zone, last_stats_date)
+            if statistics:
+                # Read the local date before the dispatch, the recorder converts the
+                # statistics start to UTC in place
+                last_stats[statistic_id] = (statistics[-1]["start"].date(), total)
+                new_statistics.append((metadata, statistics))
+
+        # Add statistics to Home Assistant, queueing both series in the recorder
+        # back to back (no await in between)
+        try:
+            for metadata, statistics in new_statistics:
+                _LOGGER.debug(
+                    "Adding %s statistics for %s",
+                    len(statistics),
+                    metadata["statistic_id"],
+                )
+                async_add_external_statistics(self.hass, metadata, statistics)
+        except Exception:
+            # Read the last statistics from the recorder again on the next insertion
+            self._last_stats = None
+            raise
 
-        # Metadata for production statistics
-        production_metadata = StatisticMetaData(
-            mean_type=StatisticMeanType.NONE,
-            has_sum=True,
-            name=f"Linky {prm} production",
-            source=DOMAIN,
-            statistic_id=production_statistic_id,
-            unit_class=EnergyConverter.UNIT_CLASS,
-            unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        )
+        self._last_stats = last_stats
+
+    async def _async_get_last_stats(self, time_zone: tzinfo) -> dict[str, tuple[date, float]]:
+        """Read the last statistic date and sum of each series from the recorder."""
+        statistic_ids = [self._consumption_metadata["statistic_id"]]
+        # Skip the production lookup when the PRM has no production data
+        if "daily_production" in self._available:
+            statistic_ids.append(self._production_metadata["statistic_id"])
 
         # Get last statistics to determine starting point
-        last_stat = await get_instance(self.hass).async_add_executor_job(
-            get_last_statistics, self.hass, 1, consumption_statistic_id, True, set()
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            _get_last_statistics, self.hass, statistic_ids
         )
 
-        # Determine if this is first time or incremental update
-        if not last_stat:
-            _LOGGER.debug("Updating statistics for the first time")
-            consumption_sum = 0.0
-            production_sum = 0.0
-            last_stats_time = None
-        else:
-            # Get info about last statistic
-            last_stats_time = last_stat[consumption_statistic_id][0]["start"]
-
-            # Get current sum from last statistic
-            consumption_sum = float(last_stat[consumption_statistic_id][0].get("sum", 0))
-
-            # Get production sum if exists
-            last_prod_stat = await get_instance(self.hass).async_add_executor_job(
-                get_last_statistics, self.hass, 1, production_statistic_id, True, set()
-            )
-            production_sum = (
-                float(last_prod_stat[production_statistic_id][0].get("sum", 0))
-                if last_prod_stat
-                else 0.0
+        # Series without statistics yet are inserted from their first reading,
+        # compare dates rather than timestamps for each reading
+        return {
+            statistic_id: (
+                dt_util.utc_from_timestamp(rows[0]["start"]).astimezone(time_zone).date(),
+                float(rows[0].get("sum", 0)),
             )
-
-        # Process consumption data (already fetched by _async_update_data)
-        consumption_statistics = []
-        if daily_consumption and daily_consumption.interval_reading:
-            for reading in daily_consumption.interval_reading:
-                reading_date = reading.date
-                # Convert date to datetime at midnight UTC
-                stat_time = datetime.combine(reading_date, datetime.min.time())
-                stat_time = dt_util.as_utc(stat_time)
-
-                # Skip if we already have this statistic
-                if last_stats_time and stat_time.timestamp() <= last_stats_time:
-                    continue
-
-                # Value in Wh
-                consumption_state = float(reading.value)
-                consumption_sum += consumption_state
-
-                consumption_statistics.append(
-                    StatisticData(
-                        start=stat_time,
-                        state=consumption_state,
-                        sum=consumption_sum,
-                    )
-                )
-
-        # Process production data (already fetched by _async_update_data)
-        production_statistics = []
-        if daily_production and daily_production.interval_reading:
-            for reading in daily_production.interval_reading:
-                reading_date = reading.date
-                # Convert date to datetime at midnight UTC
-                stat_time = datetime.combine(reading_date, datetime.min.time())
-                stat_time = dt_util.as_utc(stat_time)
-
-                # Skip if we already have this statistic
-                if last_stats_time and stat_time.timestamp() <= last_stats_time:
-                    continue
-
-                # Value in Wh
-                production_state = float(reading.value)
-                production_sum += production_state
-
-                production_statistics.append(
-                    StatisticData(
-                        start=stat_time,
-                        state=production_state,
-                        sum=production_sum,
-                    )
-                )
-
-        # Add statistics to Home Assistant
-        if consumption_statistics:
-            _LOGGER.debug(
-                "Adding %s consumption statistics",
-                len(consumption_statistics),
-            )
-            async_add_external_statistics(self.hass, consumption_metadata, consumption_statistics)
-
-        if production_statistics:
-            _LOGGER.debug(
-                "Adding %s production statistics",
-                len(production_statistics),
-            )
-            async_add_external_statistics(self.hass, production_metadata, production_statistics)
+            for statistic_id, rows in last_stats.items()
+        }
 
     async def import_statistics(self, start: date, end: date) -> None:
         """Import statistics for a custom date range."""
         _LOGGER.info("Starting import of statistics from %s to %s", start, end)
 
-        prm = self.client.prm
-
-        # Define statistic IDs
-        consumption_statistic_id = f"{DOMAIN}:{prm}_energy_consumption"
-        production_statistic_id = f"{DOMAIN}:{prm}_energy_production"
-
-        # Metadata for consumption statistics
-        consumption_metadata = StatisticMetaData(
-            mean_type=StatisticMeanType.NONE,
-            has_sum=True,
-            name=f"Linky {prm} consumption",
-            source=DOMAIN,
-            statistic_id=consumption_statistic_id,
-            unit_class=EnergyConverter.UNIT_CLASS,
-            unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        )
-
-        # Metadata for production statistics
-        production_metadata = StatisticMetaData(
-            mean_type=StatisticMeanType.NONE,
-            has_sum=True,
-            name=f"Linky {prm} production",
-            source=DOMAIN,
-            statistic_id=production_statistic_id,
-            unit_class=EnergyConverter.UNIT_CLASS,
-            unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        )
+        consumption_metadata = self._consumption_metadata
+        production_metadata = self._production_metadata
+        consumption_statistic_id = consumption_metadata["statistic_id"]
+        production_statistic_id = production_metadata["statistic_id"]
 
         # Get last statistics to calculate proper sum
-        last_stat = await get_instance(self.hass).async_add_executor_job(
-            get_last_statistics, self.hass, 1, consumption_statistic_id, True, set()
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            _get_last_statistics,
+            self.hass,
+            (consumption_statistic_id, production_statistic_id),
         )
 
         # Get the sum at the start date or initialize
-        if last_stat:
-            consumption_sum = float(last_stat[consumption_statistic_id][0].get("sum", 0))
+        if consumption_statistic_id in last_stats:
+            consumption_sum = float(last_stats[consumption_statistic_id][0].get("sum", 0))
         else:
             consumption_sum = 0.0
 
-        last_prod_stat = await get_instance(self.hass).async_add_executor_job(
-            get_last_statistics, self.hass, 1, production_statistic_id, True, set()
-        )
         production_sum = (
-            float(last_prod_stat[production_statistic_id][0].get("sum", 0))
-            if last_prod_stat
+            float(last_stats[production_statistic_id][0].get("sum", 0))
+            if production_statistic_id in last_stats
             else 0.0
         )
 
         _LOGGER.debug("Fetching consumption data from %s to %s", start, end)
 
+        time_zone = dt_util.get_default_time_zone()
+
         # Fetch consumption data
-        consumption_statistics = []
+        consumption_statistics: list[StatisticData] = []
         try:
-            daily_data = await self.client.get_daily_consumption(start=start, end=end)
-            if daily_data and daily_data.interval_reading:
-                for reading in daily_data.interval_reading:
-                    reading_date = reading.date
-                    # Convert date to datetime at midnight UTC
-                    stat_time = datetime.combine(reading_date, datetime.min.time())
-                    stat_time = dt_util.as_utc(stat_time)
-
-                    # Value in Wh
-                    consumption_state = float(reading.value)
-                    consumption_sum += consumption_state
-
-                    consumption_statistics.append(
-                        StatisticData(
-                            start=stat_time,
-                            state=consumption_state,
-                            sum=consumption_sum,
-                        )
-                    )
-
-                _LOGGER.debug("Fetched %s consumption data points", len(consumption_statistics))
+            daily_data = await self._fetch("get_daily_consumption", start, end)
+            consumption_statistics, consumption_sum = _build_statistics(
+                daily_data, consumption_sum, time_zone
+            )
+            _LOGGER.debug("Fetched %s consumption data points", len(consumption_statistics))
         except AuthenticationError:
             raise
         except APIError as err:
             _LOGGER.error("Failed to fetch consumption data for import: %s", err)
 
         # Fetch production data
-        production_statistics = []
+        production_statistics: list[StatisticData] = []
         try:
-            production_data = await self.client.get_daily_production(start=start, end=end)
-            if production_data and production_data.interval_reading:
-                for reading in production_data.interval_reading:
-                    reading_date = reading.date
-                    # Convert date to datetime at midnight UTC
-                    stat_time = datetime.combine(reading_date, datetime.min.time())
-                    stat_time = dt_util.as_utc(stat_time)
-
-                    # Value in Wh
-                    production_state = float(reading.value)
-                    production_sum += production_state
-
-                    production_statistics.append(
-                        StatisticData(
-                            start=stat_time,
-                            state=production_state,
-                            sum=production_sum,
-                        )
-                    )
-
-                _LOGGER.debug("Fetched %s production data points", len(production_statistics))
+            production_data = await self._fetch("get_daily_production", start, end)
+            production_statistics, production_sum = _build_statistics(
+                production_data, production_sum, time_zone
+            )
+            _LOGGER.debug("Fetched %s production data points", len(production_statistics))
         except AuthenticationError:
             raise
         except APIError as err:
             _LOGGER.debug("Failed to fetch production data for import: %s", err)
 
-        # Add statistics to Home Assistant
+        # Add statistics to Home Assistant, queueing both series in the recorder
+        # back to back (no await in between)
         if consumption_statistics:
             _LOGGER.info(
                 "Importing %s consumption statistics",
@@ -406,3 +523,6 @@ class LinkyDataUpdateCoordinator(DataUpdateCoordinator[LinkyData]):
                 len(production_statistics),
             )
             async_add_external_statistics(self.hass, production_metadata, production_statistics)
+
+        # The imported range changes the recorded sums, read them again next time
+        self._last_stats = None
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, time, timezone
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -18,6 +17,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from pylinky import MeteringData
 
 from . import LinkyConfigEntry
 from .const import (
@@ -27,31 +27,19 @@ from .const import (
     ATTR_USAGE_POINT_ID,
     DOMAIN,
 )
-from .coordinator import LinkyData, LinkyDataUpdateCoordinator
+from .coordinator import LinkyDataUpdateCoordinator
 
 
 @dataclass(frozen=True, kw_only=True)
 class LinkySensorEntityDescription(SensorEntityDescription):
     """Describes a Linky sensor entity."""
 
-    value_fn: Callable[[LinkyData], int | float | None]
-    available_fn: Callable[[LinkyData], bool]
-    extra_state_fn: Callable[[LinkyData], dict[str, Any]] | None = None
-    last_reset_fn: Callable[[LinkyData], datetime | None] | None = None
-
-
-def _get_last_reading_attrs(data: LinkyData, attr: str) -> dict[str, Any]:
-    """Get extra state attributes for the last reading."""
-    metering_data = getattr(data, attr)
-    if metering_data is None or not metering_data.interval_reading:
-        return {}
-    last = metering_data.interval_reading[-1]
-    return {
-        ATTR_USAGE_POINT_ID: metering_data.usage_point_id,
-        ATTR_QUALITY: metering_data.quality,
-        ATTR_LAST_VALUE: last.value,
-        ATTR_LAST_DATE: last.date.isoformat(),
-    }
+    # LinkyData attribute holding the readings of the sensor
+    data_attr: str
+    # Expose the last reading details as extra state attributes
+    reading_attrs: bool = False
+    # Reset the sensor at the start of the day of the last reading
+    daily_reset: bool = False
 
 
 SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
@@ -61,22 +49,9 @@ SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda data: (
-            data.daily_consumption.interval_reading[-1].value
-            if data.daily_consumption and data.daily_consumption.interval_reading
-            else None
-        ),
-        available_fn=lambda data: data.daily_consumption is not None,
-        extra_state_fn=lambda data: _get_last_reading_attrs(data, "daily_consumption"),
-        last_reset_fn=lambda data: (
-            datetime.combine(
-                data.daily_consumption.interval_reading[-1].date,
-                datetime.min.time(),
-                tzinfo=timezone.utc,
-            )
-            if data.daily_consumption and data.daily_consumption.interval_reading
-            else None
-        ),
+        data_attr="daily_consumption",
+        reading_attrs=True,
+        daily_reset=True,
     ),
     LinkySensorEntityDescription(
         key="current_power",
@@ -84,12 +59,7 @@ SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: (
-            data.load_curve.interval_reading[-1].value
-            if data.load_curve and data.load_curve.interval_reading
-            else None
-        ),
-        available_fn=lambda data: data.load_curve is not None,
+        data_attr="load_curve",
     ),
     LinkySensorEntityDescription(
         key="max_power",
@@ -97,13 +67,8 @@ SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE,
         device_class=SensorDeviceClass.APPARENT_POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: (
-            data.max_power.interval_reading[-1].value
-            if data.max_power and data.max_power.interval_reading
-            else None
-        ),
-        available_fn=lambda data: data.max_power is not None,
-        extra_state_fn=lambda data: _get_last_reading_attrs(data, "max_power"),
+        data_attr="max_power",
+        reading_attrs=True,
     ),
     LinkySensorEntityDescription(
         key="daily_production",
@@ -111,22 +76,9 @@ SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda data: (
-            data.daily_production.interval_reading[-1].value
-            if data.daily_production and data.daily_production.interval_reading
-            else None
-        ),
-        available_fn=lambda data: data.daily_production is not None,
-        extra_state_fn=lambda data: _get_last_reading_attrs(data, "daily_production"),
-        last_reset_fn=lambda data: (
-            datetime.combine(
-                data.daily_production.interval_reading[-1].date,
-                datetime.min.time(),
-                tzinfo=timezone.utc,
-            )
-            if data.daily_production and data.daily_production.interval_reading
-            else None
-        ),
+        data_attr="daily_production",
+        reading_attrs=True,
+        daily_reset=True,
         entity_registry_enabled_default=False,
     ),
     LinkySensorEntityDescription(
@@ -135,12 +87,7 @@ SENSOR_DESCRIPTIONS: tuple[LinkySensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: (
-            data.production_load_curve.interval_reading[-1].value
-            if data.production_load_curve and data.production_load_curve.interval_reading
-            else None
-        ),
-        available_fn=lambda data: data.production_load_curve is not None,
+        data_attr="production_load_curve",
         entity_registry_enabled_default=False,
     ),
 )
@@ -153,9 +100,18 @@ async def async_setup_entry(
 ) -> None:
     """Set up Linky sensors based on a config entry."""
     coordinator = entry.runtime_data
+    # All sensors of an entry belong to the same device
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, entry.unique_id)},
+        name=f"Linky {entry.unique_id}",
+        manufacturer="Enedis",
+        model="Linky",
+        entry_type=DeviceEntryType.SERVICE,
+    )
 
     async_add_entities(
-        LinkySensor(coordinator, description, entry) for description in SENSOR_DESCRIPTIONS
+        LinkySensor(coordinator, description, entry, device_info)
+        for description in SENSOR_DESCRIPTIONS
     )
 
 
@@ -170,61 +126,60 @@ class LinkySensor(CoordinatorEntity[LinkyDataUpdateCoordinator], SensorEntity):
         coordinator: LinkyDataUpdateCoordinator,
         description: LinkySensorEntityDescription,
         entry: LinkyConfigEntry,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{entry.unique_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.unique_id)},
-            name=f"Linky {entry.unique_id}",
-            manufacturer="Enedis",
-            model="Linky",
-            entry_type=DeviceEntryType.SERVICE,
-        )
+        self._attr_device_info = device_info
+
+    @property
+    def _metering_data(self) -> MeteringData | None:
+        """Return the readings of the sensor."""
+        if self.coordinator.data is None:
+            return None
+        return getattr(self.coordinator.data, self.entity_description.data_attr)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        if not super().available:
-            return False
-        if self.coordinator.data is None:
-            return False
-        return self.entity_description.available_fn(self.coordinator.data)
+        return super().available and self._metering_data is not None
 
     @property
     def native_value(self) -> int | float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data is None:
+        metering_data = self._metering_data
+        if metering_data is None or not metering_data.interval_reading:
             return None
-        return self.entity_description.value_fn(self.coordinator.data)
+        return metering_data.interval_reading[-1].value
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        if self.coordinator.data is None:
+        if not self.entity_description.reading_attrs:
             return None
-        if self.entity_description.extra_state_fn is None:
+        metering_data = self._metering_data
+        if metering_data is None:
             return None
-        return self.entity_description.extra_state_fn(self.coordinator.data)
+        if not metering_data.interval_reading:
+            return {}
+        last = metering_data.interval_reading[-1]
+        return {
+            ATTR_USAGE_POINT_ID: metering_data.usage_point_id,
+            ATTR_QUALITY: metering_data.quality,
+            ATTR_LAST_VALUE: last.value,
+            ATTR_LAST_DATE: last.date.isoformat(),
+        }
 
     @property
     def last_reset(self) -> datetime | None:
         """Return the time when the sensor was last reset."""
-        if self.coordinator.data is None:
-            return None
-        if self.entity_description.last_reset_fn is None:
-            return None
-        return self.entity_description.last_reset_fn(self.coordinator.data)
-        """Return the time when the sensor was last reset."""
-        if self.coordinator.data is None:
+        if not self.entity_description.daily_reset:
             return None
-        if self.entity_description.last_reset_fn is None:
+        metering_data = self._metering_data
+        if metering_data is None or not metering_data.interval_reading:
             return None
-        return self.entity_description.last_reset_fn(self.coordinator.data)
-        """Return the time when the sensor was last reset."""
-        if self.coordinator.data is None:
-            return None
-        if self.entity_description.last_reset_fn is None:
-            return None
-        return self.entity_description.last_reset_fn(self.coordinator.data)
+        return datetime.combine(
+            metering_data.interval_reading[-1].date, time.min, tzinfo=timezone.utc
+        )
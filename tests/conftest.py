@@ -1,41 +1,71 @@
 """Fixtures for Linky integration tests."""
 
-from collections.abc import Generator
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Generator
+from contextlib import ExitStack
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import jwt
 import pytest
-from homeassistant.core import HomeAssistant
+from homeassistant import config_entries
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant, State
 from pylinky import MeteringData
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.linky.const import CONF_PRM, DOMAIN
+from custom_components.linky.coordinator import FETCHERS
 
 pytest_plugins = ["pytest_homeassistant_custom_component"]
 
+INTEGRATION_CLIENT = "custom_components.linky.AsyncLinkyClient"
+CONFIG_FLOW_CLIENT = "custom_components.linky.config_flow.AsyncLinkyClient"
+# AsyncLinkyClient attributes used by the integration, prm and prms are set per instance
+CLIENT_ATTRIBUTES = ["prm", "prms", "close", *(method_name for _, method_name in FETCHERS)]
+
+# HS256 tokens signed with "secret", with a single PRM and with multiple PRMs as subject
+SINGLE_PRM_TOKEN = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+    ".eyJzdWIiOiIxMjM0NTY3ODkwMTIzNCJ9"
+    ".WlX7RSoDb-3XkJkdg85wVk5QLwmvEnNqshnoSuHkctU"
+)
+MULTI_PRM_TOKEN = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+    ".eyJzdWIiOlsiMTIzNDU2Nzg5MDEyMzQiLCI5ODc2NTQzMjEwOTg3NiJdfQ"
+    ".AjNAbq6Yxc-pPSucGka6i3r45vH1A50_ClAzb_9rwyY"
+)
+
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def auto_enable_custom_integrations(enable_custom_integrations):
-    """Enable custom integrations for all tests."""
+    """Enable custom integrations for the tests setting up the integration."""
     yield
 
 
 @pytest.fixture
+def no_rate_limit() -> Generator[None, None, None]:
+    """Raise the API rate limit for the tests sending more requests than it allows."""
+    with patch("custom_components.linky.coordinator.API_MAX_REQUESTS_PER_SECOND", 100):
+        yield
+
+
+@pytest.fixture(scope="session")
 def single_prm_token() -> str:
     """JWT token with a single PRM."""
-    return jwt.encode({"sub": "12345678901234"}, "secret", algorithm="HS256")
+    return SINGLE_PRM_TOKEN
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def multi_prm_token() -> str:
     """JWT token with multiple PRMs."""
-    return jwt.encode(
-        {"sub": ["12345678901234", "98765432109876"]},
-        "secret",
-        algorithm="HS256",
-    )
+    return MULTI_PRM_TOKEN
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def daily_consumption_data() -> MeteringData:
     """Sample daily consumption data."""
     return MeteringData.from_dict({
@@ -61,7 +91,7 @@ def daily_consumption_data() -> MeteringData:
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def load_curve_data() -> MeteringData:
     """Sample load curve data."""
     return MeteringData.from_dict({
@@ -82,7 +112,7 @@ def load_curve_data() -> MeteringData:
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def max_power_data() -> MeteringData:
     """Sample max power data."""
     return MeteringData.from_dict({
@@ -104,6 +134,76 @@ def max_power_data() -> MeteringData:
     })
 
 
+@pytest.fixture(scope="session")
+def production_data() -> MeteringData:
+    """Sample daily production data."""
+    return MeteringData.from_dict({
+        "usage_point_id": "12345678901234",
+        "start": "2024-01-01",
+        "end": "2024-01-08",
+        "quality": "BRUT",
+        "reading_type": {
+            "unit": "Wh",
+            "measurement_kind": "energy",
+            "aggregate": "sum",
+            "measuring_period": "P1D",
+        },
+        "interval_reading": [
+            {"value": "5000", "date": "2024-01-07"},
+        ],
+    })
+
+
+class FakeLinkyClient:
+    """Lightweight stand-in for AsyncLinkyClient.
+
+    Each endpoint returns the value given for it, or raises it if it is an
+    exception. The keyword arguments of every call are recorded in `calls`.
+    """
+
+    def __init__(self, prm: str = "12345678901234", **returns: Any) -> None:
+        """Initialize the fake client."""
+        self.prm = prm
+        self.prms = [prm]
+        self.calls: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._returns = returns
+
+    @classmethod
+    def all_fail(cls, exc: BaseException) -> FakeLinkyClient:
+        """Return a fake client whose endpoints all raise `exc`."""
+        return cls(**{method_name: exc for _, method_name in FETCHERS})
+
+    def _get(self, method_name: str, kwargs: dict[str, Any]) -> MeteringData | None:
+        self.calls[method_name].append(kwargs)
+        value = self._returns.get(method_name)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    async def get_daily_consumption(self, **kwargs: Any) -> MeteringData | None:
+        """Return the daily consumption."""
+        return self._get("get_daily_consumption", kwargs)
+
+    async def get_consumption_load_curve(self, **kwargs: Any) -> MeteringData | None:
+        """Return the consumption load curve."""
+        return self._get("get_consumption_load_curve", kwargs)
+
+    async def get_max_power(self, **kwargs: Any) -> MeteringData | None:
+        """Return the max power."""
+        return self._get("get_max_power", kwargs)
+
+    async def get_daily_production(self, **kwargs: Any) -> MeteringData | None:
+        """Return the daily production."""
+        return self._get("get_daily_production", kwargs)
+
+    async def get_production_load_curve(self, **kwargs: Any) -> MeteringData | None:
+        """Return the production load curve."""
+        return self._get("get_production_load_curve", kwargs)
+
+    async def close(self) -> None:
+        """Close the client."""
+
+
 def _create_mock_client(
     daily_consumption_data: MeteringData,
     load_curve_data: MeteringData,
@@ -111,7 +211,7 @@ def _create_mock_client(
     prms: list[str],
 ) -> MagicMock:
     """Create a mock AsyncLinkyClient."""
-    mock_instance = MagicMock()
+    mock_instance = MagicMock(spec_set=CLIENT_ATTRIBUTES)
     mock_instance.prm = prms[0]
     mock_instance.prms = prms
     mock_instance.get_daily_consumption = AsyncMock(return_value=daily_consumption_data)
@@ -123,51 +223,87 @@ def _create_mock_client(
     return mock_instance
 
 
-@pytest.fixture
-def mock_linky_client(
+@pytest.fixture(scope="session")
+def _single_prm_client(
     daily_consumption_data: MeteringData,
     load_curve_data: MeteringData,
     max_power_data: MeteringData,
-) -> Generator[MagicMock, None, None]:
-    """Mock AsyncLinkyClient."""
-    mock_instance = _create_mock_client(
+) -> MagicMock:
+    """Mock AsyncLinkyClient template with a single PRM, built once per session."""
+    return _create_mock_client(
         daily_consumption_data, load_curve_data, max_power_data,
         ["12345678901234"]
     )
 
-    with patch(
-        "custom_components.linky.AsyncLinkyClient", return_value=mock_instance
-    ), patch(
-        "custom_components.linky.config_flow.AsyncLinkyClient", return_value=mock_instance
-    ):
-        yield mock_instance
 
-
-@pytest.fixture
-def mock_linky_client_multi_prm(
+@pytest.fixture(scope="session")
+def _multi_prm_client(
     daily_consumption_data: MeteringData,
     load_curve_data: MeteringData,
     max_power_data: MeteringData,
-) -> Generator[MagicMock, None, None]:
-    """Mock AsyncLinkyClient with multiple PRMs."""
-    mock_instance = _create_mock_client(
+) -> MagicMock:
+    """Mock AsyncLinkyClient template with multiple PRMs, built once per session."""
+    return _create_mock_client(
         daily_consumption_data, load_curve_data, max_power_data,
         ["12345678901234", "98765432109876"]
     )
 
-    with patch(
-        "custom_components.linky.AsyncLinkyClient", return_value=mock_instance
-    ), patch(
-        "custom_components.linky.config_flow.AsyncLinkyClient", return_value=mock_instance
-    ):
+
+def _patch_client(
+    mock_instance: MagicMock, *targets: str
+) -> Generator[MagicMock, None, None]:
+    """Patch AsyncLinkyClient with a mock, clearing the calls of previous tests."""
+    mock_instance.reset_mock()
+
+    with ExitStack() as stack:
+        for target in targets:
+            stack.enter_context(patch(target, return_value=mock_instance))
         yield mock_instance
 
 
 @pytest.fixture
-async def mock_config_entry(hass: HomeAssistant, single_prm_token: str):
-    """Create a mock config entry."""
-    from pytest_homeassistant_custom_component.common import MockConfigEntry
+def mock_linky_client(_single_prm_client: MagicMock) -> Generator[MagicMock, None, None]:
+    """Mock AsyncLinkyClient in both the integration and the config flow."""
+    yield from _patch_client(_single_prm_client, INTEGRATION_CLIENT, CONFIG_FLOW_CLIENT)
+
+
+@pytest.fixture
+def mock_linky_client_integration(
+    _single_prm_client: MagicMock,
+) -> Generator[MagicMock, None, None]:
+    """Mock AsyncLinkyClient used to set up config entries."""
+    yield from _patch_client(_single_prm_client, INTEGRATION_CLIENT)
+
+
+@pytest.fixture
+def mock_linky_client_config_flow(
+    _single_prm_client: MagicMock,
+) -> Generator[MagicMock, None, None]:
+    """Mock AsyncLinkyClient used by the config flow."""
+    yield from _patch_client(_single_prm_client, CONFIG_FLOW_CLIENT)
+
+
+@pytest.fixture
+def mock_linky_client_multi_prm(
+    _multi_prm_client: MagicMock,
+) -> Generator[MagicMock, None, None]:
+    """Mock AsyncLinkyClient with multiple PRMs."""
+    yield from _patch_client(_multi_prm_client, INTEGRATION_CLIENT, CONFIG_FLOW_CLIENT)
 
+
+@pytest.fixture
+def set_client(monkeypatch: pytest.MonkeyPatch) -> Callable[[str, Any], None]:
+    """Replace an AsyncLinkyClient import until the end of the test."""
+
+    def _set(target: str, value: Any) -> None:
+        monkeypatch.setattr(target, value)
+
+    return _set
+
+
+@pytest.fixture
+async def mock_config_entry(hass: HomeAssistant, single_prm_token: str) -> MockConfigEntry:
+    """Create a mock config entry."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         title="Linky 12345678901234",
@@ -179,3 +315,44 @@ async def mock_config_entry(hass: HomeAssistant, single_prm_token: str):
     )
     entry.add_to_hass(hass)
     return entry
+
+
+@pytest.fixture
+async def loaded_entry(
+    hass: HomeAssistant,
+    mock_linky_client_integration: MagicMock,
+    mock_config_entry: MockConfigEntry,
+) -> MockConfigEntry:
+    """Set up the mock config entry."""
+    # Setup awaits the coordinator's first refresh and the sensor platform,
+    # so the sensor states are written when it returns
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    return mock_config_entry
+
+
+@pytest.fixture
+def sensor_states(hass: HomeAssistant, loaded_entry: MockConfigEntry) -> dict[str, State]:
+    """Snapshot the sensor states once the mock config entry is loaded."""
+    return {state.entity_id: state for state in hass.states.async_all(SENSOR_DOMAIN)}
+
+
+@pytest.fixture
+async def flow_started(hass: HomeAssistant) -> ConfigFlowResult:
+    """Start a user config flow."""
+    return await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+
+@pytest.fixture
+async def flow_select_prm(
+    hass: HomeAssistant,
+    flow_started: ConfigFlowResult,
+    multi_prm_token: str,
+    mock_linky_client_multi_prm: MagicMock,
+) -> ConfigFlowResult:
+    """Submit a token with multiple PRMs to a user config flow."""
+    return await hass.config_entries.flow.async_configure(
+        flow_started["flow_id"],
+        {CONF_TOKEN: multi_prm_token},
+    )
@@ -1,32 +1,36 @@
 """Tests for the Linky config flow."""
 
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from homeassistant import config_entries
+from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_TOKEN
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 from pylinky import InvalidTokenError, PRMAccessError
 
-from custom_components.linky.const import CONF_PRM, DOMAIN
+from custom_components.linky.const import CONF_PRM
+
+from .conftest import CLIENT_ATTRIBUTES, CONFIG_FLOW_CLIENT
+
+pytestmark = pytest.mark.usefixtures("auto_enable_custom_integrations")
 
 
 async def test_form_single_prm(
     hass: HomeAssistant,
+    flow_started: ConfigFlowResult,
     single_prm_token: str,
     mock_linky_client: MagicMock,
 ) -> None:
     """Test successful config flow with single PRM."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
-    assert result["type"] is FlowResultType.FORM
-    assert result["step_id"] == "user"
-    assert result["errors"] == {}
+    assert flow_started["type"] is FlowResultType.FORM
+    assert flow_started["step_id"] == "user"
+    assert flow_started["errors"] == {}
 
     result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
+        flow_started["flow_id"],
         {CONF_TOKEN: single_prm_token},
     )
 
@@ -41,28 +45,16 @@ async def test_form_single_prm(
 
 async def test_form_multi_prm(
     hass: HomeAssistant,
-    multi_prm_token: str,
-    mock_linky_client_multi_prm: MagicMock,
+    flow_select_prm: ConfigFlowResult,
 ) -> None:
     """Test config flow with multiple PRMs shows selection step."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
-    assert result["type"] is FlowResultType.FORM
-    assert result["step_id"] == "user"
-
-    result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
-        {CONF_TOKEN: multi_prm_token},
-    )
-
     # Should show PRM selection step
-    assert result["type"] is FlowResultType.FORM
-    assert result["step_id"] == "select_prm"
+    assert flow_select_prm["type"] is FlowResultType.FORM
+    assert flow_select_prm["step_id"] == "select_prm"
 
     # Select a PRM
     result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
+        flow_select_prm["flow_id"],
         {CONF_PRM: "98765432109876"},
     )
 
@@ -71,91 +63,86 @@ async def test_form_multi_prm(
     assert result["data"][CONF_PRM] == "98765432109876"
 
 
-async def test_form_invalid_token(hass: HomeAssistant) -> None:
-    """Test error handling for invalid token."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
+async def test_form_closes_clients(
+    hass: HomeAssistant,
+    flow_select_prm: ConfigFlowResult,
+    mock_linky_client_multi_prm: MagicMock,
+    set_client: Callable[[str, Any], None],
+) -> None:
+    """Test that the flow closes the clients it no longer uses."""
+    prm_client = MagicMock(spec_set=CLIENT_ATTRIBUTES)
+    prm_client.close = AsyncMock()
+    set_client(CONFIG_FLOW_CLIENT, MagicMock(return_value=prm_client))
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_select_prm["flow_id"],
+        {CONF_PRM: "98765432109876"},
     )
+    await hass.async_block_till_done()
 
-    with patch(
-        "custom_components.linky.config_flow.AsyncLinkyClient",
-        side_effect=InvalidTokenError("Invalid token"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {CONF_TOKEN: "invalid-token"},
-        )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    # The token client is replaced by the PRM client, which is closed with the flow
+    mock_linky_client_multi_prm.close.assert_awaited_once()
+    prm_client.close.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected_error"),
+    [
+        (InvalidTokenError("Invalid token"), "invalid_token"),
+        (RuntimeError("Unknown error"), "unknown"),
+    ],
+)
+async def test_form_error(
+    hass: HomeAssistant,
+    flow_started: ConfigFlowResult,
+    set_client: Callable[[str, Any], None],
+    exc: Exception,
+    expected_error: str,
+) -> None:
+    """Test error handling when submitting the token."""
+    set_client(CONFIG_FLOW_CLIENT, MagicMock(side_effect=exc))
+    result = await hass.config_entries.flow.async_configure(
+        flow_started["flow_id"],
+        {CONF_TOKEN: "some-token"},
+    )
 
     assert result["type"] is FlowResultType.FORM
-    assert result["errors"] == {"base": "invalid_token"}
+    assert result["errors"] == {"base": expected_error}
 
 
 async def test_form_prm_access_denied(
     hass: HomeAssistant,
-    multi_prm_token: str,
-    mock_linky_client_multi_prm: MagicMock,
+    flow_select_prm: ConfigFlowResult,
+    set_client: Callable[[str, Any], None],
 ) -> None:
     """Test error handling for PRM access denied."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    assert flow_select_prm["type"] is FlowResultType.FORM
+    assert flow_select_prm["step_id"] == "select_prm"
 
+    # Mock PRMAccessError for the selection step - use a valid PRM from the list
+    set_client(CONFIG_FLOW_CLIENT, MagicMock(side_effect=PRMAccessError("98765432109876")))
     result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
-        {CONF_TOKEN: multi_prm_token},
+        flow_select_prm["flow_id"],
+        {CONF_PRM: "98765432109876"},
     )
 
-    assert result["type"] is FlowResultType.FORM
-    assert result["step_id"] == "select_prm"
-
-    # Mock PRMAccessError for the selection step - use a valid PRM from the list
-    with patch(
-        "custom_components.linky.config_flow.AsyncLinkyClient",
-        side_effect=PRMAccessError("98765432109876"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {CONF_PRM: "98765432109876"},
-        )
-
     assert result["type"] is FlowResultType.FORM
     assert result["errors"] == {"base": "prm_access_denied"}
 
 
 async def test_form_already_configured(
     hass: HomeAssistant,
+    flow_started: ConfigFlowResult,
     single_prm_token: str,
-    mock_linky_client: MagicMock,
+    mock_linky_client_config_flow: MagicMock,
     mock_config_entry,
 ) -> None:
     """Test that we abort if already configured."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
-
     result = await hass.config_entries.flow.async_configure(
-        result["flow_id"],
+        flow_started["flow_id"],
         {CONF_TOKEN: single_prm_token},
     )
 
     assert result["type"] is FlowResultType.ABORT
     assert result["reason"] == "already_configured"
-
-
-async def test_form_unknown_error(hass: HomeAssistant) -> None:
-    """Test error handling for unknown errors."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
-
-    with patch(
-        "custom_components.linky.config_flow.AsyncLinkyClient",
-        side_effect=RuntimeError("Unknown error"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {CONF_TOKEN: "some-token"},
-        )
-
-    assert result["type"] is FlowResultType.FORM
-    assert result["errors"] == {"base": "unknown"}
@@ -1,13 +1,61 @@
 """Tests for the Linky DataUpdateCoordinator."""
 
-from unittest.mock import AsyncMock
+import asyncio
+from contextlib import AbstractContextManager
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import async_add_external_statistics
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 from pylinky import APIError, AuthenticationError, MeteringData
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.linky.coordinator import LinkyData, LinkyDataUpdateCoordinator
+from custom_components.linky.const import (
+    CONF_PRM,
+    CONF_PRODUCTION_DISABLED,
+    DOMAIN,
+    PRODUCTION_MAX_FAILURES,
+)
+from custom_components.linky.coordinator import (
+    LinkyData,
+    LinkyDataUpdateCoordinator,
+    RateLimiter,
+    _build_statistics,
+)
+
+from .conftest import FakeLinkyClient
+
+
+class FakeClock:
+    """Event loop clock which only moves forward when the rate limiter sleeps."""
+
+    def __init__(self) -> None:
+        """Initialize the clock at zero."""
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Record the delay and move the clock forward."""
+        self.sleeps.append(delay)
+        self.now += delay
+        # Let the other callers run while this one is waiting
+        await asyncio.sleep(0)
+
+    def patch(self) -> AbstractContextManager[MagicMock]:
+        """Patch the clock and sleep used by the rate limiter."""
+        return patch(
+            "custom_components.linky.coordinator.asyncio",
+            MagicMock(get_running_loop=lambda: self, sleep=self.sleep),
+        )
 
 
 async def test_coordinator_update_success(
@@ -17,12 +65,11 @@ async def test_coordinator_update_success(
     max_power_data: MeteringData,
 ) -> None:
     """Test successful data update."""
-    mock_client = AsyncMock()
-    mock_client.get_daily_consumption = AsyncMock(return_value=daily_consumption_data)
-    mock_client.get_consumption_load_curve = AsyncMock(return_value=load_curve_data)
-    mock_client.get_max_power = AsyncMock(return_value=max_power_data)
-    mock_client.get_daily_production = AsyncMock(return_value=None)
-    mock_client.get_production_load_curve = AsyncMock(return_value=None)
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_consumption_load_curve=load_curve_data,
+        get_max_power=max_power_data,
+    )
 
     coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
     data = await coordinator._async_update_data()
@@ -40,30 +87,15 @@ async def test_coordinator_update_with_production(
     daily_consumption_data: MeteringData,
     load_curve_data: MeteringData,
     max_power_data: MeteringData,
+    production_data: MeteringData,
 ) -> None:
     """Test data update with production data."""
-    production_data = MeteringData.from_dict({
-        "usage_point_id": "12345678901234",
-        "start": "2024-01-01",
-        "end": "2024-01-08",
-        "quality": "BRUT",
-        "reading_type": {
-            "unit": "Wh",
-            "measurement_kind": "energy",
-            "aggregate": "sum",
-            "measuring_period": "P1D",
-        },
-        "interval_reading": [
-            {"value": "5000", "date": "2024-01-07"},
-        ],
-    })
-
-    mock_client = AsyncMock()
-    mock_client.get_daily_consumption = AsyncMock(return_value=daily_consumption_data)
-    mock_client.get_consumption_load_curve = AsyncMock(return_value=load_curve_data)
-    mock_client.get_max_power = AsyncMock(return_value=max_power_data)
-    mock_client.get_daily_production = AsyncMock(return_value=production_data)
-    mock_client.get_production_load_curve = AsyncMock(return_value=None)
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_consumption_load_curve=load_curve_data,
+        get_max_power=max_power_data,
+        get_daily_production=production_data,
+    )
 
     coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
     data = await coordinator._async_update_data()
@@ -71,19 +103,39 @@ async def test_coordinator_update_with_production(
     assert data.daily_production == production_data
 
 
+@pytest.mark.usefixtures("no_rate_limit")
+async def test_coordinator_incremental_update(
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+) -> None:
+    """Test that only recent days are fetched after a successful update."""
+    mock_client = FakeLinkyClient(get_daily_consumption=daily_consumption_data)
+
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+    today = date.today()
+
+    await coordinator._async_update_data()
+    assert mock_client.calls["get_daily_consumption"][-1]["start"] == today - timedelta(days=7)
+
+    await coordinator._async_update_data()
+
+    assert mock_client.calls["get_daily_consumption"][-1]["start"] == today - timedelta(days=1)
+    # Series without readings keep using the full window
+    assert mock_client.calls["get_max_power"][-1]["start"] == today - timedelta(days=7)
+
+
 async def test_coordinator_partial_failure(
     hass: HomeAssistant,
     daily_consumption_data: MeteringData,
 ) -> None:
     """Test that partial API failures don't fail the entire update."""
-    mock_client = AsyncMock()
-    mock_client.get_daily_consumption = AsyncMock(return_value=daily_consumption_data)
-    mock_client.get_consumption_load_curve = AsyncMock(
-        side_effect=APIError(400, "No data available")
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_consumption_load_curve=APIError(400, "No data available"),
+        get_max_power=APIError(400, "No data available"),
+        get_daily_production=APIError(400, "No data"),
+        get_production_load_curve=APIError(400, "No data"),
     )
-    mock_client.get_max_power = AsyncMock(side_effect=APIError(400, "No data available"))
-    mock_client.get_daily_production = AsyncMock(side_effect=APIError(400, "No data"))
-    mock_client.get_production_load_curve = AsyncMock(side_effect=APIError(400, "No data"))
 
     coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
     data = await coordinator._async_update_data()
@@ -94,27 +146,120 @@ async def test_coordinator_partial_failure(
     assert data.max_power is None
 
 
-async def test_coordinator_authentication_error(hass: HomeAssistant) -> None:
-    """Test that authentication errors raise UpdateFailed."""
-    mock_client = AsyncMock()
-    # AuthenticationError is a subclass of APIError, so we need to raise it
-    # before any other API call
-    mock_client.get_daily_consumption = AsyncMock(
-        side_effect=AuthenticationError("Token expired")
-    )
-    mock_client.get_consumption_load_curve = AsyncMock(
-        side_effect=AuthenticationError("Token expired")
+@pytest.mark.usefixtures("no_rate_limit")
+async def test_coordinator_production_disabled_after_failures(
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+) -> None:
+    """Test that production endpoints are skipped after repeated failures."""
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_daily_production=APIError(404, "No data"),
+        get_production_load_curve=APIError(404, "No data"),
     )
-    mock_client.get_max_power = AsyncMock(
-        side_effect=AuthenticationError("Token expired")
+
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+
+    for _ in range(PRODUCTION_MAX_FAILURES + 2):
+        await coordinator._async_update_data()
+
+    # Production is only checked once a day after being disabled
+    assert len(mock_client.calls["get_daily_production"]) == PRODUCTION_MAX_FAILURES
+    assert len(mock_client.calls["get_production_load_curve"]) == PRODUCTION_MAX_FAILURES
+
+
+@pytest.mark.usefixtures("no_rate_limit")
+async def test_coordinator_setup_probes_series(
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+) -> None:
+    """Test that series unavailable at setup are not fetched on update."""
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_max_power=APIError(404, "No data"),
+        get_daily_production=APIError(404, "No data"),
+        get_production_load_curve=APIError(404, "No data"),
     )
-    mock_client.get_daily_production = AsyncMock(
-        side_effect=AuthenticationError("Token expired")
+
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+
+    await coordinator._async_setup()
+    data = await coordinator._async_update_data()
+
+    # The probe covers the update window and is reused by the first refresh
+    assert data.daily_consumption == daily_consumption_data
+    assert mock_client.calls["get_daily_consumption"] == [
+        {"start": date.today() - timedelta(days=7), "end": date.today()}
+    ]
+
+    await coordinator._async_update_data()
+
+    assert len(mock_client.calls["get_daily_consumption"]) == 2
+    assert len(mock_client.calls["get_daily_production"]) == 1
+
+
+@pytest.mark.usefixtures("no_rate_limit")
+async def test_coordinator_setup_retries_consumption_series(
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+    load_curve_data: MeteringData,
+) -> None:
+    """Test that a consumption series failing at setup is fetched on the next refresh."""
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_consumption_load_curve=APIError(500, "Server error"),
     )
-    mock_client.get_production_load_curve = AsyncMock(
-        side_effect=AuthenticationError("Token expired")
+
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+
+    await coordinator._async_setup()
+    mock_client._returns["get_consumption_load_curve"] = load_curve_data
+    data = await coordinator._async_update_data()
+
+    assert data.load_curve == load_curve_data
+    assert len(mock_client.calls["get_consumption_load_curve"]) == 2
+    # The series fetched by the probe are not fetched again
+    assert len(mock_client.calls["get_daily_consumption"]) == 1
+
+
+@pytest.mark.usefixtures("no_rate_limit")
+async def test_coordinator_setup_persists_production_disabled(
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+) -> None:
+    """Test that a meter without production is remembered across restarts."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_PRM: "12345678901234"})
+    entry.add_to_hass(hass)
+    mock_client = FakeLinkyClient(
+        get_daily_consumption=daily_consumption_data,
+        get_daily_production=APIError(404, "No data"),
+        get_production_load_curve=APIError(404, "No data"),
     )
 
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+    coordinator.config_entry = entry
+
+    await coordinator._async_setup()
+
+    assert entry.options == {CONF_PRODUCTION_DISABLED: True}
+
+
+async def test_coordinator_setup_authentication_error(hass: HomeAssistant) -> None:
+    """Test that authentication errors during setup start reauthentication."""
+    mock_client = FakeLinkyClient(get_daily_consumption=AuthenticationError("Token expired"))
+
+    coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_setup()
+
+
+async def test_coordinator_authentication_error(hass: HomeAssistant) -> None:
+    """Test that authentication errors raise UpdateFailed."""
+    # AuthenticationError is a subclass of APIError, so we need to raise it
+    # before any other API call
+    mock_client = FakeLinkyClient.all_fail(AuthenticationError("Token expired"))
+
     coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
 
     with pytest.raises(UpdateFailed, match="Authentication failed"):
@@ -123,12 +268,7 @@ async def test_coordinator_authentication_error(hass: HomeAssistant) -> None:
 
 async def test_coordinator_no_data(hass: HomeAssistant) -> None:
     """Test that complete failure to fetch data raises UpdateFailed."""
-    mock_client = AsyncMock()
-    mock_client.get_daily_consumption = AsyncMock(side_effect=APIError(400, "No data"))
-    mock_client.get_consumption_load_curve = AsyncMock(side_effect=APIError(400, "No data"))
-    mock_client.get_max_power = AsyncMock(side_effect=APIError(400, "No data"))
-    mock_client.get_daily_production = AsyncMock(side_effect=APIError(400, "No data"))
-    mock_client.get_production_load_curve = AsyncMock(side_effect=APIError(400, "No data"))
+    mock_client = FakeLinkyClient.all_fail(APIError(400, "No data"))
 
     coordinator = LinkyDataUpdateCoordinator(hass, mock_client)
 
@@ -136,6 +276,97 @@ async def test_coordinator_no_data(hass: HomeAssistant) -> None:
         await coordinator._async_update_data()
 
 
+async def test_build_statistics(daily_consumption_data: MeteringData) -> None:
+    """Test statistics are built from new readings with a running sum."""
+    statistics, total = _build_statistics(
+        daily_consumption_data, 1000.0, dt_util.UTC, after=date(2024, 1, 5)
+    )
+
+    assert [stat["start"].date() for stat in statistics] == [date(2024, 1, 6), date(2024, 1, 7)]
+    assert [stat["state"] for stat in statistics] == [15600.0, 12100.0]
+    assert statistics[-1]["sum"] == total == 1000.0 + 15600.0 + 12100.0
+
+    assert _build_statistics(None, 1000.0, dt_util.UTC) == ([], 1000.0)
+
+
+async def test_rate_limiter_waits_for_window() -> None:
+    """Test that requests over the limit wait for the end of the window."""
+    clock = FakeClock()
+    rate_limiter = RateLimiter(2)
+
+    with clock.patch():
+        await rate_limiter.acquire()
+        await rate_limiter.acquire()
+        assert clock.sleeps == []
+
+        clock.now = 0.25
+        await rate_limiter.acquire()
+        assert clock.sleeps == [0.75]
+        assert clock.now == 1.0
+
+        # Requests older than the window no longer count
+        clock.now = 2.5
+        await rate_limiter.acquire()
+        assert clock.sleeps == [0.75]
+
+
+async def test_rate_limiter_serialises_callers() -> None:
+    """Test that concurrent callers wait for each other."""
+    clock = FakeClock()
+    rate_limiter = RateLimiter(1)
+
+    with clock.patch():
+        await asyncio.gather(*(rate_limiter.acquire() for _ in range(3)))
+
+    # Each caller waits for the request of the previous one to leave the window
+    assert clock.sleeps == [1.0, 1.0]
+    assert clock.now == 2.0
+
+
+async def test_insert_statistics_east_of_utc(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    daily_consumption_data: MeteringData,
+) -> None:
+    """Test that recorded days are not inserted again in a time zone east of UTC."""
+    # Local midnight is on the previous day in UTC
+    await hass.config.async_set_time_zone("Europe/Paris")
+    coordinator = LinkyDataUpdateCoordinator(hass, FakeLinkyClient())
+
+    with patch(
+        "custom_components.linky.coordinator.async_add_external_statistics",
+        wraps=async_add_external_statistics,
+    ) as mock_add_statistics:
+        await coordinator._insert_statistics(daily_consumption=daily_consumption_data)
+        await coordinator._insert_statistics(daily_consumption=daily_consumption_data)
+
+    mock_add_statistics.assert_called_once()
+    assert coordinator._last_stats == {
+        "linky:12345678901234_energy_consumption": (date(2024, 1, 7), 91397.0)
+    }
+
+
+async def test_insert_statistics_production_without_consumption(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    production_data: MeteringData,
+) -> None:
+    """Test that production days are not inserted again when consumption is missing."""
+    coordinator = LinkyDataUpdateCoordinator(hass, FakeLinkyClient())
+
+    with patch(
+        "custom_components.linky.coordinator.async_add_external_statistics",
+        wraps=async_add_external_statistics,
+    ) as mock_add_statistics:
+        await coordinator._insert_statistics(daily_production=production_data)
+        await coordinator._insert_statistics(daily_production=production_data)
+
+    mock_add_statistics.assert_called_once()
+    assert coordinator._last_stats == {
+        "linky:12345678901234_energy_production": (date(2024, 1, 7), 5000.0)
+    }
+
+
 async def test_linky_data_dataclass() -> None:
     """Test LinkyData dataclass defaults."""
     data = LinkyData()
@@ -145,3 +376,5 @@ async def test_linky_data_dataclass() -> None:
     assert data.max_power is None
     assert data.daily_production is None
     assert data.production_load_curve is None
+    # Equal data does not notify listeners again
+    assert data == LinkyData()
@@ -1,18 +1,34 @@
 """Tests for Linky integration setup and unload."""
 
+from collections.abc import Callable
+from datetime import date
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
 from pylinky import InvalidTokenError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.linky.const import DOMAIN
+from custom_components.linky import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END_DATE,
+    ATTR_START_DATE,
+    SERVICE_IMPORT_HISTORICAL_DATA,
+)
+from custom_components.linky.const import CONF_PRM, DOMAIN
+from custom_components.linky.coordinator import LinkyDataUpdateCoordinator
+
+from .conftest import INTEGRATION_CLIENT, SINGLE_PRM_TOKEN
+
+pytestmark = pytest.mark.usefixtures("auto_enable_custom_integrations")
 
 
 async def test_setup_entry(
     hass: HomeAssistant,
-    mock_linky_client: MagicMock,
+    mock_linky_client_integration: MagicMock,
     mock_config_entry,
 ) -> None:
     """Test successful setup of config entry."""
@@ -26,14 +42,12 @@ async def test_setup_entry(
 async def test_setup_entry_invalid_token(
     hass: HomeAssistant,
     mock_config_entry,
+    set_client: Callable[[str, Any], None],
 ) -> None:
     """Test setup fails with invalid token."""
-    with patch(
-        "custom_components.linky.AsyncLinkyClient",
-        side_effect=InvalidTokenError("Invalid token"),
-    ):
-        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
-        await hass.async_block_till_done()
+    set_client(INTEGRATION_CLIENT, MagicMock(side_effect=InvalidTokenError("Invalid token")))
+    result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
 
     assert result is False
     assert mock_config_entry.state is ConfigEntryState.SETUP_ERROR
@@ -41,12 +55,11 @@ async def test_setup_entry_invalid_token(
 
 async def test_unload_entry(
     hass: HomeAssistant,
-    mock_linky_client: MagicMock,
+    mock_linky_client_integration: MagicMock,
     mock_config_entry,
 ) -> None:
     """Test unloading a config entry."""
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
 
     assert mock_config_entry.state is ConfigEntryState.LOADED
 
@@ -59,14 +72,143 @@ async def test_unload_entry(
 
 async def test_setup_creates_coordinator(
     hass: HomeAssistant,
-    mock_linky_client: MagicMock,
+    mock_linky_client_integration: MagicMock,
     mock_config_entry,
 ) -> None:
     """Test that setup creates a coordinator in runtime_data."""
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
-    from custom_components.linky.coordinator import LinkyDataUpdateCoordinator
 
     assert mock_config_entry.runtime_data is not None
     assert isinstance(mock_config_entry.runtime_data, LinkyDataUpdateCoordinator)
+
+
+async def test_service_registered_once(
+    hass: HomeAssistant,
+    mock_linky_client_integration: MagicMock,
+    mock_config_entry,
+) -> None:
+    """Test that the import service outlives the config entries."""
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, "import_historical_data")
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, "import_historical_data")
+
+
+async def test_import_service_single_entry(
+    hass: HomeAssistant,
+    mock_linky_client_integration: MagicMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test importing historical data for a single meter."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Linky 98765432109876",
+        data={"token": SINGLE_PRM_TOKEN, CONF_PRM: "98765432109876"},
+        unique_id="98765432109876",
+    )
+    other_entry.add_to_hass(hass)
+    # Setting up the integration sets up all its entries
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    assert other_entry.state is ConfigEntryState.LOADED
+
+    with patch.object(
+        LinkyDataUpdateCoordinator, "import_statistics", autospec=True
+    ) as mock_import:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_HISTORICAL_DATA,
+            {
+                ATTR_CONFIG_ENTRY_ID: other_entry.entry_id,
+                ATTR_START_DATE: "2024-01-01",
+                ATTR_END_DATE: "2024-01-07",
+            },
+            blocking=True,
+        )
+
+    mock_import.assert_awaited_once_with(
+        other_entry.runtime_data, date(2024, 1, 1), date(2024, 1, 7)
+    )
+
+
+async def test_import_service_all_entries(
+    hass: HomeAssistant,
+    mock_linky_client_integration: MagicMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test importing historical data for all loaded meters."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Linky 98765432109876",
+        data={"token": SINGLE_PRM_TOKEN, CONF_PRM: "98765432109876"},
+        unique_id="98765432109876",
+    )
+    other_entry.add_to_hass(hass)
+    not_loaded_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Linky 11111111111111",
+        data={"token": SINGLE_PRM_TOKEN, CONF_PRM: "11111111111111"},
+        unique_id="11111111111111",
+    )
+    # Setting up the integration sets up all its entries
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    assert other_entry.state is ConfigEntryState.LOADED
+    not_loaded_entry.add_to_hass(hass)
+
+    with patch.object(
+        LinkyDataUpdateCoordinator, "import_statistics", autospec=True
+    ) as mock_import:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_HISTORICAL_DATA,
+            {ATTR_START_DATE: "2024-01-01", ATTR_END_DATE: "2024-01-07"},
+            blocking=True,
+        )
+
+    assert {call.args[0] for call in mock_import.await_args_list} == {
+        mock_config_entry.runtime_data,
+        other_entry.runtime_data,
+    }
+    assert mock_import.await_count == 2
+
+
+async def test_import_service_invalid_entry(
+    hass: HomeAssistant,
+    mock_linky_client_integration: MagicMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the import service rejects entries which are not loaded Linky meters."""
+    other_domain_entry = MockConfigEntry(domain="other", title="Other")
+    other_domain_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    for entry_id in ("unknown", other_domain_entry.entry_id):
+        with pytest.raises(ServiceValidationError, match="is not a Linky meter"):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_IMPORT_HISTORICAL_DATA,
+                {ATTR_CONFIG_ENTRY_ID: entry_id, ATTR_START_DATE: "2024-01-01"},
+                blocking=True,
+            )
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+    with pytest.raises(ServiceValidationError, match="is not loaded"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_HISTORICAL_DATA,
+            {ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id, ATTR_START_DATE: "2024-01-01"},
+            blocking=True,
+        )
+
+    with pytest.raises(ServiceValidationError, match="No Linky meter is loaded"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_HISTORICAL_DATA,
+            {ATTR_START_DATE: "2024-01-01"},
+            blocking=True,
+        )
@@ -4,22 +4,20 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 from homeassistant.const import STATE_UNAVAILABLE, UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-from pylinky import MeteringData
 
 from custom_components.linky.const import DOMAIN
 
+pytestmark = pytest.mark.usefixtures("auto_enable_custom_integrations")
+
 
 async def test_sensors_created(
     hass: HomeAssistant,
-    mock_linky_client: AsyncMock,
-    mock_config_entry,
+    loaded_entry,
 ) -> None:
     """Test that sensors are created."""
-    await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
     entity_registry = er.async_get(hass)
 
     # Check consumption sensors are created
@@ -33,59 +31,47 @@ async def test_sensors_created(
     assert entry.disabled_by is not None
 
 
-async def test_daily_consumption_sensor(
-    hass: HomeAssistant,
-    mock_linky_client: AsyncMock,
-    mock_config_entry,
-    daily_consumption_data: MeteringData,
+@pytest.mark.parametrize(
+    ("entity_id", "expected_state", "expected_attributes"),
+    [
+        (
+            "sensor.linky_12345678901234_daily_consumption",
+            # Last reading value
+            "12100",
+            {
+                "unit_of_measurement": UnitOfEnergy.WATT_HOUR,
+                "device_class": "energy",
+                "state_class": "total",
+                "usage_point_id": "12345678901234",
+                "quality": "BRUT",
+            },
+        ),
+        (
+            "sensor.linky_12345678901234_current_power",
+            # Last load curve value
+            "520",
+            {"unit_of_measurement": UnitOfPower.WATT, "device_class": "power"},
+        ),
+        (
+            "sensor.linky_12345678901234_maximum_power",
+            # Last max power value
+            "5800",
+            {"unit_of_measurement": "VA", "device_class": "apparent_power"},
+        ),
+    ],
+)
+async def test_sensor_values(
+    sensor_states: dict[str, State],
+    entity_id: str,
+    expected_state: str,
+    expected_attributes: dict[str, str],
 ) -> None:
-    """Test daily consumption sensor values."""
-    await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
-    state = hass.states.get("sensor.linky_12345678901234_daily_consumption")
+    """Test sensor values and attributes."""
+    state = sensor_states.get(entity_id)
     assert state is not None
-    # Last reading value
-    assert state.state == "12100"
-    assert state.attributes["unit_of_measurement"] == UnitOfEnergy.WATT_HOUR
-    assert state.attributes["device_class"] == "energy"
-    assert state.attributes["state_class"] == "total"
-    assert state.attributes["usage_point_id"] == "12345678901234"
-    assert state.attributes["quality"] == "BRUT"
-
-
-async def test_current_power_sensor(
-    hass: HomeAssistant,
-    mock_linky_client: AsyncMock,
-    mock_config_entry,
-) -> None:
-    """Test current power sensor."""
-    await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
-    state = hass.states.get("sensor.linky_12345678901234_current_power")
-    assert state is not None
-    # Last load curve value
-    assert state.state == "520"
-    assert state.attributes["unit_of_measurement"] == UnitOfPower.WATT
-    assert state.attributes["device_class"] == "power"
-
-
-async def test_max_power_sensor(
-    hass: HomeAssistant,
-    mock_linky_client: AsyncMock,
-    mock_config_entry,
-) -> None:
-    """Test max power sensor."""
-    await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
-    state = hass.states.get("sensor.linky_12345678901234_maximum_power")
-    assert state is not None
-    # Last max power value
-    assert state.state == "5800"
-    assert state.attributes["unit_of_measurement"] == "VA"
-    assert state.attributes["device_class"] == "apparent_power"
+    assert state.state == expected_state
+    for attribute, value in expected_attributes.items():
+        assert state.attributes[attribute] == value
 
 
 async def test_sensor_unavailable_when_no_data(
@@ -114,21 +100,15 @@ async def test_sensor_unavailable_when_no_data(
 
 async def test_device_info(
     hass: HomeAssistant,
-    mock_linky_client: AsyncMock,
-    mock_config_entry,
+    loaded_entry,
 ) -> None:
     """Test device info is properly set."""
-    await hass.config_entries.async_setup(mock_config_entry.entry_id)
-    await hass.async_block_till_done()
-
     entity_registry = er.async_get(hass)
     entry = entity_registry.async_get("sensor.linky_12345678901234_daily_consumption")
 
     assert entry is not None
     assert entry.device_id is not None
 
-    from homeassistant.helpers import device_registry as dr
-
     device_registry = dr.async_get(hass)
     device = device_registry.async_get(entry.device_id)
 